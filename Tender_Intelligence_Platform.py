@@ -2,16 +2,24 @@
 # Automated tender monitoring and lead generation for actuarial advisory services
 
 import os
+import sys
+import importlib.util
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import pickle
+import sqlite3
 import csv
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, fields, is_dataclass
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Union, Iterable, Iterator, Pattern, TextIO
 from enum import Enum
-import time
 import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
@@ -25,16 +33,64 @@ except Exception:  # pragma: no cover - optional dependency
         print(str(x))
     class Markdown(str):
         pass
+# Aho-Corasick keyword matching is optional; falls back to substring checks
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+# orjson is optional; falls back to the stdlib json encoder
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+# tiktoken is optional; without it prompt text is truncated by an approximate character count
+try:
+    import tiktoken  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
 from openai import OpenAI
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 
+# pandas is only needed by _load_recent_opportunities_raw, which imports it on first use
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+from llm_cache import LLMCache, cached_chat, make_cache_key, parse_ttl
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Closing date formats tried by TenderScraper._extract_date
+DATE_FORMATS = (
+    "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y",
+    "%d-%m-%Y", "%Y/%m/%d", "%B %d, %Y"
+)
+
+# Prompt text shared by single-tender and batched analysis so their scores stay comparable
+ANALYSIS_SYSTEM_PROMPT = """You are a senior business development manager for an actuarial advisory firm specializing in insurance, pensions, risk management, and regulatory compliance. Analyze tender opportunities and provide strategic business insights."""
+CONTEXT_SCORE_CRITERIA = "an integer between 0-40 scoring how closely the requirements match actuarial services, the complexity and scope of work, the potential for follow-on work and the strategic value for the firm"
+
+# How long LLM responses are served from the cache
+LLM_CACHE_TTL = "7d"
+
+# Token budgets for tender text sent to the LLM (roughly the previous 2000/1500 character slices)
+ANALYSIS_TEXT_TOKENS = 500
+BATCH_TEXT_TOKENS = 375
+
+# BeautifulSoup parser: lxml is C-backed and much faster; html.parser is the stdlib fallback
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+# Slotted dataclasses drop the per-instance __dict__; slots=True needs Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 class TenderStatus(Enum):
     OPEN = "open"
     CLOSING_SOON = "closing_soon"  # Within 7 days
@@ -57,7 +113,15 @@ class ServiceArea(Enum):
     INVESTMENT_CONSULTING = "investment_consulting"
     GOVERNANCE_RISK = "governance_risk"
 
-@dataclass
+# Display names for service areas, e.g. "Pension Consulting"
+SERVICE_AREA_LABELS = {area: area.value.replace('_', ' ').title() for area in ServiceArea}
+
+@lru_cache(maxsize=None)
+def _format_service_areas(areas: Tuple[ServiceArea, ...]) -> str:
+    """Comma-separated display names for a sequence of service areas"""
+    return ", ".join(SERVICE_AREA_LABELS[area] for area in areas)
+
+@dataclass(**_DATACLASS_OPTIONS)
 class TenderSite:
     """Represents a tender/procurement website to monitor"""
     url: str
@@ -70,7 +134,7 @@ class TenderSite:
     last_checked: Optional[datetime] = None
     active: bool = True
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TenderOpportunity:
     """Represents a tender opportunity"""
     title: str
@@ -96,7 +160,7 @@ class TenderOpportunity:
     documents_available: List[str]
     timestamp: datetime
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LeadReport:
     """Business development lead report"""
     opportunity: TenderOpportunity
@@ -108,12 +172,120 @@ class LeadReport:
     next_steps: List[str]
     deadline_tracker: str
 
+# Resolved ChromeDriver path, shared by every scraper in the process
+_DRIVER_PATH: Optional[str] = None
+_DRIVER_PATH_LOCK = threading.Lock()
+
+def _resolve_driver_path() -> str:
+    """Return the ChromeDriver path, resolving it at most once per process
+    
+    An existing SELENIUM_DRIVER_PATH is used as-is, skipping webdriver-manager's
+    version check (a network round-trip) entirely and allowing offline runs.
+    """
+    global _DRIVER_PATH
+    with _DRIVER_PATH_LOCK:
+        if _DRIVER_PATH is None:
+            configured_path = os.getenv('SELENIUM_DRIVER_PATH')
+            if configured_path and os.path.isfile(configured_path):
+                _DRIVER_PATH = configured_path
+            else:
+                _DRIVER_PATH = ChromeDriverManager().install()
+        return _DRIVER_PATH
+
+@lru_cache(maxsize=32)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> Pattern:
+    """Compile a case-insensitive alternation matching any of keywords, longest first"""
+    return re.compile(
+        "|".join(sorted({re.escape(keyword) for keyword in keywords}, key=len, reverse=True)),
+        re.IGNORECASE
+    )
+
+_URL_RE = re.compile(r"https?://\S+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _clean_for_llm(text: str) -> str:
+    """Drop URLs and collapse whitespace runs so prompt tokens go to tender content"""
+    return _WHITESPACE_RE.sub(" ", _URL_RE.sub("", text)).strip()
+
+@lru_cache(maxsize=None)
+def _token_encoding(model: str):
+    """Return the tiktoken encoding for model, or None if it can't be loaded"""
+    if tiktoken is None:
+        return None
+    
+    # Encodings are downloaded on first use, which fails offline or behind a proxy;
+    # the None result is cached so later calls don't retry the download
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Token encoding unavailable, truncating by character count: {str(e)}")
+        return None
+
+def _truncate_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """Truncate text to at most max_tokens tokens of model's encoding"""
+    # Every token covers at least one character, so short text can't exceed the budget
+    if len(text) <= max_tokens:
+        return text
+    
+    encoding = _token_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]  # ~4 characters per token for English text
+    
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+@lru_cache(maxsize=None)
+def _field_names(cls) -> Tuple[str, ...]:
+    """Field names of a dataclass type, introspected once per class"""
+    return tuple(f.name for f in fields(cls))
+
+def _json_default(obj):
+    """Serialize values the JSON encoder can't handle natively"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        # Shallow mapping; unlike dataclasses.asdict it does not deep-copy every field
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+    return str(obj)
+
+def _dumps_line(obj) -> bytes:
+    """Serialize a dict or dataclass instance as a single JSONL line"""
+    if orjson is not None:
+        # orjson encodes dataclasses, enums and datetimes natively, with no intermediate dict
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, default=_json_default) + "\n").encode("utf-8")
+
+def _loads(data: bytes):
+    """Parse JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 class ActuarialTenderAnalyzer:
     """AI-powered analyzer for actuarial tender opportunities"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_path: Optional[Union[str, Path]] = None):
         self.openai = OpenAI(api_key=api_key)
         
+        # Persistent LLM response cache so re-listed tenders don't trigger new API calls
+        self.llm_cache = LLMCache(cache_path) if cache_path else None
+        
         # Actuarial service keywords categorized
         self.service_keywords = {
             ServiceArea.IFRS17: [
@@ -162,80 +334,238 @@ class ActuarialTenderAnalyzer:
         self.all_keywords = []
         for keywords_list in self.service_keywords.values():
             self.all_keywords.extend(keywords_list)
+        
+        # Reverse index from keyword to the service areas that list it
+        self._kw_to_areas: Dict[str, List[ServiceArea]] = {}
+        for service_area, keywords_list in self.service_keywords.items():
+            for keyword in keywords_list:
+                self._kw_to_areas.setdefault(keyword, []).append(service_area)
+        
+        self._keywords_lower = [keyword.lower() for keyword in self.all_keywords]
+        self._automaton = self._build_keyword_automaton()
+    
+    def _build_keyword_automaton(self):
+        """Build an Aho-Corasick automaton mapping each lowercase keyword to its positions in all_keywords"""
+        if ahocorasick is None:
+            return None
+        
+        positions: Dict[str, List[int]] = {}
+        for idx, keyword in enumerate(self._keywords_lower):
+            positions.setdefault(keyword, []).append(idx)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, indices in positions.items():
+            automaton.add_word(keyword, tuple(indices))
+        automaton.make_automaton()
+        
+        return automaton
     
-    def analyze_tender(self, tender_text: str, tender_title: str, tender_url: str) -> Tuple[OpportunityScore, List[ServiceArea], str]:
-        """Analyze tender content for actuarial relevance and opportunity score"""
+    def analyze_tender(self, tender_text: str, tender_title: str, tender_url: str,
+                       combined_lower: Optional[str] = None) -> Tuple[OpportunityScore, List[ServiceArea], str, List[str]]:
+        """Analyze tender content for actuarial relevance and opportunity score
+        
+        combined_lower is the lowercased title/description text used for keyword
+        matching; pass it when the caller already has it to avoid rebuilding it.
+        """
+        
+        if combined_lower is None:
+            combined_lower = (tender_text + " " + tender_title).lower()
         
         # Find matching keywords and service areas
-        matched_keywords = self._find_keywords(tender_text + " " + tender_title)
+        matched_keywords = self._find_keywords_lower(combined_lower)
         matched_service_areas = self._identify_service_areas(matched_keywords)
         
+        # Score context and generate AI analysis in a single request
+        context_score, ai_analysis = self._score_and_analyze(tender_text, tender_title, matched_service_areas)
+        
         # Calculate opportunity score based on keyword matches and context
-        opportunity_score = self._calculate_opportunity_score(matched_keywords, tender_text)
+        opportunity_score = self._combine_scores(matched_keywords, context_score)
+        
+        return opportunity_score, matched_service_areas, ai_analysis, matched_keywords
+    
+    def analyze_tenders_batch(self, items: List[Tuple[str, str, str]],
+                              combined_lower: Optional[List[str]] = None) -> List[Tuple[OpportunityScore, List[ServiceArea], str, List[str]]]:
+        """Analyze several (id, title, text) tenders with a single LLM call
+        
+        Results are returned in the same order as items. Each tender's result is
+        cached on its own, so only tenders without a cached result are sent to the
+        model. Tenders missing from the model's response (or the whole batch, if the
+        response can't be parsed) fall back to the per-tender analyze_tender path.
+        combined_lower optionally holds the precomputed lowercased keyword-matching
+        text for each item.
+        """
+        
+        if combined_lower is None:
+            combined_lower = [(text + " " + title).lower() for _, title, text in items]
+        
+        prepared = []
+        results: Dict[str, Dict] = {}
+        pending: Dict[str, Tuple[str, str]] = {}
+        for (tender_id, title, text), text_lower in zip(items, combined_lower):
+            matched_keywords = self._find_keywords_lower(text_lower)
+            service_areas = self._identify_service_areas(matched_keywords)
+            
+            # IDs name tenders in the prompt and response, so they must be unique within the batch
+            prompt_id, n = tender_id, 1
+            while prompt_id in results or prompt_id in pending:
+                n += 1
+                prompt_id = f"{tender_id}#{n}"
+            
+            tender_block = f"""
+        Title: {title}
+        Matched Service Areas: {_format_service_areas(tuple(service_areas))}
+        Tender Content: {_truncate_tokens(_clean_for_llm(text), BATCH_TEXT_TOKENS)}
+        """
+            cache_key = make_cache_key(
+                "gpt-4o-mini",
+                [{"role": "system", "content": ANALYSIS_SYSTEM_PROMPT}, {"role": "user", "content": tender_block}],
+                context_score_criteria=CONTEXT_SCORE_CRITERIA
+            )
+            
+            prepared.append((prompt_id, title, text, text_lower, matched_keywords, service_areas))
+            cached = self._cached_batch_result(cache_key)
+            if cached is not None:
+                results[prompt_id] = cached
+            else:
+                pending[prompt_id] = (cache_key, tender_block)
+        
+        if pending:
+            results.update(self._request_batch(pending))
+        
+        analyses = []
+        for prompt_id, title, text, text_lower, matched_keywords, service_areas in prepared:
+            result = results.get(prompt_id)
+            
+            try:
+                context_score = max(0, min(40, int(result["context_score"])))
+                analysis = str(result["analysis"])
+            except (TypeError, KeyError, ValueError):
+                analyses.append(self.analyze_tender(text, title, "", combined_lower=text_lower))
+                continue
+            
+            analyses.append((self._combine_scores(matched_keywords, context_score), service_areas, analysis, matched_keywords))
+        
+        return analyses
+    
+    def _request_batch(self, pending: Dict[str, Tuple[str, str]]) -> Dict[str, Dict]:
+        """Analyze uncached tenders, given as {id: (cache_key, tender_block)}, in one request
+        
+        Valid results are cached per tender, so a tender is answered from the cache
+        in later runs whichever batch it lands in.
+        """
+        tender_blocks = "".join(
+            f"""
+        ### Tender ID: {prompt_id}{tender_block}"""
+            for prompt_id, (_, tender_block) in pending.items()
+        )
+        
+        user_prompt = f"""
+        Analyze each of the following tender opportunities.
+        {tender_blocks}
+        
+        For each tender provide:
+        - context_score: {CONTEXT_SCORE_CRITERIA}
+        - analysis: a concise 300-400 word analysis covering key requirements, scope of work, strategic value, competitive landscape, recommended approach and team composition, and risk factors
+        
+        Return JSON of the form {{"results": [{{"id": "<Tender ID>", "context_score": <int>, "analysis": "<text>"}}]}} with one entry per tender.
+        """
+        
+        try:
+            # The whole-prompt cache in _chat is bypassed; results are cached per tender below
+            content = self._complete(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"}
+            )
+            results = self._parse_batch_response(content)
+        except Exception as e:
+            logger.warning(f"Batch analysis failed, falling back to per-tender analysis: {str(e)}")
+            return {}
+        
+        for prompt_id, (cache_key, _) in pending.items():
+            result = results.get(prompt_id)
+            try:
+                self._store_batch_result(cache_key, {
+                    "context_score": int(result["context_score"]),
+                    "analysis": str(result["analysis"])
+                })
+            except (TypeError, KeyError, ValueError):
+                continue
+        
+        return results
+    
+    def _cached_batch_result(self, cache_key: str) -> Optional[Dict]:
+        """Return a tender's cached batch result, or None"""
+        if self.llm_cache is None:
+            return None
+        
+        try:
+            content = self.llm_cache.get(cache_key)
+            return json.loads(content) if content is not None else None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"LLM cache lookup failed: {str(e)}")
+            return None
+    
+    def _store_batch_result(self, cache_key: str, result: Dict):
+        """Cache a tender's batch result"""
+        if self.llm_cache is None:
+            return
+        
+        try:
+            self.llm_cache.set(cache_key, json.dumps(result), parse_ttl(LLM_CACHE_TTL))
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache write failed: {str(e)}")
+    
+    def _parse_json_response(self, content: str):
+        """Parse a JSON model response, tolerating ```json code fences"""
+        content = content.strip()
+        if content.startswith("```"):
+            content = re.sub(r"^```(?:json)?\s*|\s*```$", "", content)
         
-        # Generate AI analysis
-        ai_analysis = self._generate_ai_analysis(tender_text, tender_title, matched_service_areas)
+        return json.loads(content)
+    
+    def _parse_batch_response(self, content: str) -> Dict[str, Dict]:
+        """Parse a batched JSON response into a mapping of tender ID to result"""
+        data = self._parse_json_response(content)
+        results = data.get("results", []) if isinstance(data, dict) else data
         
-        return opportunity_score, matched_service_areas, ai_analysis
+        return {str(result["id"]): result for result in results if isinstance(result, dict) and "id" in result}
     
     def _find_keywords(self, text: str) -> List[str]:
         """Find matching keywords in tender text"""
-        text_lower = text.lower()
-        found_keywords = []
+        return self._find_keywords_lower(text.lower())
+    
+    def _find_keywords_lower(self, text_lower: str) -> List[str]:
+        """Find matching keywords in already-lowercased tender text"""
+        if self._automaton is None:
+            return [
+                keyword for keyword, keyword_lower in zip(self.all_keywords, self._keywords_lower)
+                if keyword_lower in text_lower
+            ]
         
-        for keyword in self.all_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
+        # Single linear pass over the text; results keep all_keywords order
+        matched = set()
+        for _, indices in self._automaton.iter(text_lower):
+            matched.update(indices)
         
-        return found_keywords
+        return [self.all_keywords[idx] for idx in sorted(matched)]
     
     def _identify_service_areas(self, keywords: List[str]) -> List[ServiceArea]:
         """Identify which service areas match based on keywords"""
-        matched_areas = []
-        
-        for service_area, area_keywords in self.service_keywords.items():
-            for keyword in keywords:
-                if keyword in area_keywords:
-                    if service_area not in matched_areas:
-                        matched_areas.append(service_area)
-                    break
+        found_areas = {area for keyword in keywords for area in self._kw_to_areas.get(keyword, ())}
         
-        return matched_areas
+        # Keep the service_keywords ordering
+        return [service_area for service_area in self.service_keywords if service_area in found_areas]
     
-    def _calculate_opportunity_score(self, keywords: List[str], tender_text: str) -> OpportunityScore:
-        """Calculate opportunity score based on keyword matches and context"""
+    def _combine_scores(self, keywords: List[str], context_score: int) -> OpportunityScore:
+        """Combine keyword matches and AI context points into an opportunity score"""
         
         # Base score from keyword matches
         keyword_score = min(len(keywords) * 10, 60)  # Max 60 points from keywords
         
-        # Context scoring using AI
-        try:
-            response = self.openai.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{
-                    "role": "user",
-                    "content": f"""
-                    Score this tender opportunity for an actuarial advisory firm on a scale of 0-40 (additional context points):
-                    
-                    Consider:
-                    - How closely the requirements match actuarial services
-                    - Complexity and scope of work
-                    - Potential for follow-on work
-                    - Strategic value for the firm
-                    
-                    Tender text: {tender_text[:1000]}
-                    
-                    Return only a number between 0-40.
-                    """
-                }]
-            )
-            
-            context_score = int(response.choices[0].message.content.strip())
-            context_score = max(0, min(40, context_score))  # Ensure 0-40 range
-            
-        except:
-            context_score = 20  # Default moderate score
-        
         total_score = keyword_score + context_score
         
         if total_score >= 80:
@@ -247,12 +577,10 @@ class ActuarialTenderAnalyzer:
         else:
             return OpportunityScore.MINIMAL
     
-    def _generate_ai_analysis(self, tender_text: str, title: str, service_areas: List[ServiceArea]) -> str:
-        """Generate detailed AI analysis of the tender opportunity"""
+    def _score_and_analyze(self, tender_text: str, title: str, service_areas: List[ServiceArea]) -> Tuple[int, str]:
+        """Get AI context score (0-40) and detailed analysis of the tender in one request"""
         
-        service_areas_text = ", ".join([area.value.replace("_", " ").title() for area in service_areas])
-        
-        system_prompt = """You are a senior business development manager for an actuarial advisory firm specializing in insurance, pensions, risk management, and regulatory compliance. Analyze tender opportunities and provide strategic business insights."""
+        service_areas_text = _format_service_areas(tuple(service_areas))
         
         user_prompt = f"""
         Analyze this tender opportunity:
@@ -260,48 +588,122 @@ class ActuarialTenderAnalyzer:
         Title: {title}
         Matched Service Areas: {service_areas_text}
         
-        Tender Content: {tender_text[:2000]}
+        Tender Content: {_truncate_tokens(_clean_for_llm(tender_text), ANALYSIS_TEXT_TOKENS)}
         
-        Provide a concise analysis covering:
-        1. Key requirements and how they align with our actuarial services
-        2. Potential scope of work and engagement size
-        3. Strategic value and growth potential
-        4. Competitive landscape assessment
-        5. Recommended approach and team composition
-        6. Risk factors and challenges
+        Provide:
+        - context_score: {CONTEXT_SCORE_CRITERIA}
+        - analysis: a concise analysis covering
+            1. Key requirements and how they align with our actuarial services
+            2. Potential scope of work and engagement size
+            3. Strategic value and growth potential
+            4. Competitive landscape assessment
+            5. Recommended approach and team composition
+            6. Risk factors and challenges
+          Keep the analysis to 300-400 words, focused on actionable business insights.
         
-        Keep response to 300-400 words, focused on actionable business insights.
+        Return JSON of the form {{"context_score": <int>, "analysis": "<text>"}}.
         """
         
         try:
-            response = self.openai.chat.completions.create(
+            content = self._chat(
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
-                ]
+                ],
+                response_format={"type": "json_object"}
             )
-            
-            return response.choices[0].message.content
+            result = self._parse_json_response(content)
+            if not isinstance(result, dict):
+                raise ValueError("expected a JSON object")
             
         except Exception as e:
             logger.error(f"Error generating AI analysis: {str(e)}")
-            return f"Analysis error occurred. Manual review required. Matched areas: {service_areas_text}"
+            return 20, f"Analysis error occurred. Manual review required. Matched areas: {service_areas_text}"
+        
+        try:
+            context_score = max(0, min(40, int(result["context_score"])))  # Ensure 0-40 range
+        except (TypeError, KeyError, ValueError):
+            context_score = 20  # Default moderate score
+        
+        analysis = result.get("analysis") or f"Analysis unavailable. Manual review required. Matched areas: {service_areas_text}"
+        
+        return context_score, str(analysis)
+    
+    @cached_chat(ttl=LLM_CACHE_TTL)
+    def _chat(self, model: str, messages: List[Dict[str, str]], **params) -> str:
+        """Send a chat completion request and return the message content"""
+        return self._complete(model, messages, **params)
+    
+    def _complete(self, model: str, messages: List[Dict[str, str]], **params) -> str:
+        """Send a chat completion request without consulting the cache"""
+        response = self.openai.chat.completions.create(model=model, messages=messages, **params)
+        return response.choices[0].message.content
 
 class TenderScraper:
     """Enhanced web scraper for tender/procurement sites"""
     
-    def __init__(self):
+    def __init__(self, request_timeout: float = 20, pool_size: int = 8):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # Sites are fetched from concurrent worker threads; size the connection pool to match
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.request_timeout = request_timeout
+        
+        # Headless Chrome is started lazily and reused across scrapes
+        self._driver = None
+        self._driver_lock = threading.RLock()
+    
+    def _get_driver(self):
+        """Return the shared headless Chrome driver, starting it on first use"""
+        with self._driver_lock:
+            if self._driver is None:
+                chrome_options = Options()
+                chrome_options.add_argument("--headless")
+                self._driver = webdriver.Chrome(service=Service(_resolve_driver_path()), options=chrome_options)
+            
+            return self._driver
+    
+    def _fetch(self, url: str) -> bytes:
+        """GET a page with the shared session, bounded by request_timeout"""
+        response = self.session.get(url, timeout=self.request_timeout)
+        response.raise_for_status()
+        return response.content
+    
+    def close(self):
+        """Shut down the shared browser, if one was started"""
+        with self._driver_lock:
+            if self._driver is not None:
+                try:
+                    self._driver.quit()
+                except Exception as e:
+                    logger.warning(f"Error closing browser: {str(e)}")
+                finally:
+                    self._driver = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def scrape_tender_site(self, site: TenderSite, keywords: List[str]) -> List[TenderOpportunity]:
-        """Scrape a tender site for relevant opportunities"""
+        """Scrape a tender site for relevant opportunities
+        
+        Fetch and parse failures are logged and re-raised, so callers can tell an
+        unreachable site apart from one with no relevant listings.
+        """
         
         opportunities = []
         
+        # Lowercase and dedupe keywords once per scrape; the tuple also keys the compiled pattern cache
+        keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+        
         if site.name.lower() in ['ungm', 'united nations']:
             opportunities.extend(self._scrape_ungm(site, keywords))
         elif site.name.lower() in ['world bank', 'worldbank']:
@@ -322,16 +724,22 @@ class TenderScraper:
             # UNGM search URL with actuarial/financial keywords
             search_url = "https://www.ungm.org/Public/Notice"
             
-            # Use Selenium for JavaScript-heavy sites
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            driver.get(search_url)
-            time.sleep(5)
+            # Use Selenium for JavaScript-heavy sites; the browser is shared, so hold it while loading
+            with self._driver_lock:
+                driver = self._get_driver()
+                driver.get(search_url)
+                
+                # Wait only until listings render rather than a fixed delay
+                try:
+                    WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.notice-card, tr.notice-row"))
+                    )
+                except TimeoutException:
+                    logger.warning("Timed out waiting for UNGM notices to load")
+                
+                page_source = driver.page_source
             
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, HTML_PARSER)
             
             # Find tender listings (adapt selectors based on actual site structure)
             tender_cards = soup.find_all('div', class_='notice-card') or soup.find_all('tr', class_='notice-row')
@@ -341,10 +749,11 @@ class TenderScraper:
                 if opportunity and self._contains_relevant_keywords(opportunity.title + " " + opportunity.description, keywords):
                     opportunities.append(opportunity)
             
-            driver.quit()
-            
         except Exception as e:
             logger.error(f"Error scraping UNGM: {str(e)}")
+            # Drop a possibly broken browser so the next scrape starts a fresh one
+            self.close()
+            raise
         
         return opportunities
     
@@ -356,8 +765,7 @@ class TenderScraper:
             # World Bank procurement search
             search_url = "https://projects.worldbank.org/en/projects-operations/procurement"
             
-            response = self.session.get(search_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self._fetch(search_url), HTML_PARSER)
             
             # Extract procurement opportunities
             proc_items = soup.find_all('div', class_='procurement-item') or soup.find_all('a', href=re.compile('procurement'))
@@ -369,6 +777,7 @@ class TenderScraper:
             
         except Exception as e:
             logger.error(f"Error scraping World Bank: {str(e)}")
+            raise
         
         return opportunities
     
@@ -380,8 +789,7 @@ class TenderScraper:
             # TED search for financial/consulting services
             search_url = "https://ted.europa.eu/udl"
             
-            response = self.session.get(search_url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self._fetch(search_url), HTML_PARSER)
             
             # Extract tender notices
             notices = soup.find_all('div', class_='notice') or soup.find_all('article', class_='tender')
@@ -393,6 +801,7 @@ class TenderScraper:
             
         except Exception as e:
             logger.error(f"Error scraping TED: {str(e)}")
+            raise
         
         return opportunities
     
@@ -401,8 +810,7 @@ class TenderScraper:
         opportunities = []
         
         try:
-            response = self.session.get(site.url)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(self._fetch(site.url), HTML_PARSER)
             
             # Common selectors for tender listings
             tender_selectors = [
@@ -424,6 +832,7 @@ class TenderScraper:
             
         except Exception as e:
             logger.error(f"Error scraping {site.name}: {str(e)}")
+            raise
         
         return opportunities
     
@@ -492,33 +901,38 @@ class TenderScraper:
         if not date_text:
             return None
         
-        # Try to parse various date formats
-        date_formats = [
-            "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", 
-            "%d-%m-%Y", "%Y/%m/%d", "%B %d, %Y"
-        ]
+        date_text = date_text[:10]
         
-        for fmt in date_formats:
+        # Fixed order, so dates valid in both day/month orders always parse the same way
+        for fmt in DATE_FORMATS:
             try:
-                return datetime.strptime(date_text[:10], fmt)
-            except:
+                return datetime.strptime(date_text, fmt)
+            except ValueError:
                 continue
         
         return None
     
     def _contains_relevant_keywords(self, text: str, keywords: List[str]) -> bool:
-        """Check if text contains relevant keywords"""
-        text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in keywords)
+        """Check if text contains any of the keywords"""
+        return _keyword_pattern(tuple(keywords)).search(text) is not None
 
 class ActuarialTenderMonitor:
     """Main monitoring system for actuarial tender opportunities"""
     
     def __init__(self, api_key: str, data_dir: str = "tender_data"):
-        self.analyzer = ActuarialTenderAnalyzer(api_key)
-        self.scraper = TenderScraper()
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.analyzer = ActuarialTenderAnalyzer(api_key, cache_path=self.data_dir / "llm_cache.sqlite3")
+        self.scraper = TenderScraper()
+        
+        # Number of tenders analyzed per LLM request
+        self.analysis_batch_size = 10
+        
+        # Number of sites scraped and analyzed concurrently
+        self.max_site_workers = 8
+        
+        # Number of saved data files read concurrently
+        self.max_load_workers = 8
         
         # Load monitoring sites
         self.tender_sites = self._load_tender_sites()
@@ -608,77 +1022,173 @@ class ActuarialTenderMonitor:
             )
         ]
         
+        # Restore when each site was last checked so schedules survive restarts
+        self._restore_site_state(sites)
+        
         return sites
     
-    def monitor_all_sites(self) -> List[TenderOpportunity]:
-        """Monitor all sites for tender opportunities"""
+    def _restore_site_state(self, sites: List[TenderSite]):
+        """Apply last_checked times persisted by _save_site_state"""
+        state_path = self.data_dir / "sites.json"
+        if not state_path.exists():
+            return
+        
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading site state {state_path}: {str(e)}")
+            return
+        
+        if not isinstance(state, dict):
+            logger.error(f"Ignoring malformed site state {state_path}")
+            return
+        
+        for site in sites:
+            # A bad entry only costs that site its schedule; it is treated as never checked
+            try:
+                last_checked = state.get(site.name, {}).get('last_checked')
+                if last_checked:
+                    site.last_checked = datetime.fromisoformat(last_checked)
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.warning(f"Ignoring malformed site state for {site.name}: {str(e)}")
+    
+    def _save_site_state(self):
+        """Persist each site's last_checked time to sites.json"""
+        state = {
+            site.name: {'last_checked': site.last_checked.isoformat() if site.last_checked else None}
+            for site in self.tender_sites
+        }
+        
+        # Write to a temporary file first so an interrupted run can't leave truncated state
+        state_path = self.data_dir / "sites.json"
+        tmp_path = state_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, state_path)
+    
+    # Slack in the due check: a scheduled run that starts slightly earlier than the last
+    # one would otherwise find the site not yet due and skip it for a whole period
+    _DUE_TOLERANCE = timedelta(minutes=5)
+    
+    def _is_due(self, site: TenderSite, now: datetime) -> bool:
+        """Check whether check_frequency hours have passed since the site was last checked"""
+        if site.last_checked is None:
+            return True
+        return now - site.last_checked >= timedelta(hours=site.check_frequency) - self._DUE_TOLERANCE
+    
+    def monitor_all_sites(self, force: bool = False) -> List[TenderOpportunity]:
+        """Monitor all sites for tender opportunities
+        
+        Sites checked within their check_frequency are skipped unless force is set.
+        """
         all_opportunities = []
         
-        logger.info(f"Starting tender monitoring across {len(self.tender_sites)} sites...")
+        now = datetime.now()
+        active_sites = [
+            site for site in self.tender_sites
+            if site.active and (force or self._is_due(site, now))
+        ]
+        
+        skipped = sum(1 for site in self.tender_sites if site.active) - len(active_sites)
+        if skipped:
+            logger.info(f"Skipping {skipped} sites checked within their check frequency")
         
-        for site in self.tender_sites:
-            if not site.active:
-                continue
-                
-            logger.info(f"Monitoring {site.name}...")
+        logger.info(f"Starting tender monitoring across {len(active_sites)} sites...")
+        
+        # Scraping and analysis are I/O bound, so sites are processed concurrently.
+        # Results are collected in site order to keep output deterministic.
+        if active_sites:
+            with ThreadPoolExecutor(max_workers=min(self.max_site_workers, len(active_sites))) as executor:
+                futures = [executor.submit(self._process_site, site) for site in active_sites]
+                for future in futures:
+                    all_opportunities.extend(future.result())
+        
+        # Save opportunities and site schedule
+        self._save_opportunities(all_opportunities)
+        self._save_site_state()
+        
+        logger.info(f"Total relevant opportunities found: {len(all_opportunities)}")
+        return all_opportunities
+    
+    def _process_site(self, site: TenderSite) -> List[TenderOpportunity]:
+        """Scrape and analyze a single site, returning its relevant opportunities"""
+        logger.info(f"Monitoring {site.name}...")
+        
+        # Record the start time rather than the end, so scrape duration doesn't push back the next check
+        started_at = datetime.now()
+        
+        try:
+            opportunities = self.scraper.scrape_tender_site(site, self.all_keywords)
             
-            try:
-                opportunities = self.scraper.scrape_tender_site(site, self.all_keywords)
+            # Analyze opportunities with AI, several tenders per request
+            for batch in _chunked(opportunities, self.analysis_batch_size):
+                # Build the lowercase keyword-matching text once per tender
+                combined_lower = [(opportunity.title + " " + opportunity.description).lower() for opportunity in batch]
                 
-                # Analyze each opportunity with AI
-                for opportunity in opportunities:
-                    score, service_areas, analysis = self.analyzer.analyze_tender(
-                        opportunity.description + " " + opportunity.title,
-                        opportunity.title,
-                        opportunity.url
-                    )
-                    
+                # The title is sent in its own prompt field, so only the description goes in as content
+                results = self.analyzer.analyze_tenders_batch(
+                    [(opportunity.tender_id, opportunity.title, opportunity.description) for opportunity in batch],
+                    combined_lower=combined_lower
+                )
+                
+                for opportunity, (score, service_areas, analysis, matched_keywords) in zip(batch, results):
                     opportunity.opportunity_score = score
                     opportunity.service_areas_matched = service_areas
                     opportunity.ai_analysis = analysis
-                    opportunity.keywords_matched = self.analyzer._find_keywords(
-                        opportunity.title + " " + opportunity.description
-                    )
-                
-                # Filter for relevant opportunities (Medium+ score)
-                relevant_opportunities = [
-                    opp for opp in opportunities 
-                    if opp.opportunity_score in [OpportunityScore.HIGH, OpportunityScore.MEDIUM]
-                ]
-                
-                all_opportunities.extend(relevant_opportunities)
-                
-                # Update last checked
-                site.last_checked = datetime.now()
-                
-                logger.info(f"Found {len(relevant_opportunities)} relevant opportunities from {site.name}")
-                
-            except Exception as e:
-                logger.error(f"Error monitoring {site.name}: {str(e)}")
-        
-        # Save opportunities
-        for opp in all_opportunities:
-            self._save_opportunity(opp)
-        
-        logger.info(f"Total relevant opportunities found: {len(all_opportunities)}")
-        return all_opportunities
+                    opportunity.keywords_matched = matched_keywords
+            
+            # Filter for relevant opportunities (Medium+ score)
+            relevant_opportunities = [
+                opp for opp in opportunities 
+                if opp.opportunity_score in [OpportunityScore.HIGH, OpportunityScore.MEDIUM]
+            ]
+            
+            # Update last checked; a failed scrape raises above, leaving the site due for a retry
+            site.last_checked = started_at
+            
+            logger.info(f"Found {len(relevant_opportunities)} relevant opportunities from {site.name}")
+            
+            return relevant_opportunities
+            
+        except Exception as e:
+            logger.error(f"Error monitoring {site.name}: {str(e)}")
+            return []
     
-    def _save_opportunity(self, opportunity: TenderOpportunity):
-        """Save opportunity to file"""
-        filename = f"{opportunity.timestamp.strftime('%Y%m%d')}_{opportunity.tender_id.replace('/', '_')}.json"
-        filepath = self.data_dir / filename
+    def close(self):
+        """Release the browser and cache connections held by the monitor"""
+        self.scraper.close()
+        if self.analyzer.llm_cache is not None:
+            self.analyzer.llm_cache.close()
+    
+    def _save_opportunities(self, opportunities: List[TenderOpportunity]):
+        """Append opportunities to the per-day JSONL log, one line per opportunity"""
+        lines_by_day: Dict[str, List[bytes]] = {}
+        for opportunity in opportunities:
+            date_str = opportunity.timestamp.strftime('%Y%m%d')
+            lines_by_day.setdefault(date_str, []).append(_dumps_line(opportunity))
         
-        with open(filepath, 'w') as f:
-            json.dump(asdict(opportunity), f, indent=2, default=str)
+        for date_str, lines in lines_by_day.items():
+            with open(self.data_dir / f"{date_str}.jsonl", 'ab') as f:
+                f.writelines(lines)
     
-    def generate_leads_report(self, days_back: int = 7) -> str:
-        """Generate business development leads report"""
+    def generate_leads_report(self, days_back: int = 7, writer: Optional[TextIO] = None) -> Optional[str]:
+        """Generate business development leads report
+        
+        Returns the report as a string, or writes it section by section to writer
+        (a text file-like object) and returns None.
+        """
+        
+        # Sections go straight to the writer when given, otherwise they are collected and joined
+        parts: List[str] = []
+        emit = parts.append if writer is None else writer.write
         
         # Load recent opportunities
         opportunities = self._load_recent_opportunities(days_back)
         
         if not opportunities:
-            return "No tender opportunities found in the specified period."
+            emit("No tender opportunities found in the specified period.")
+            return "".join(parts) if writer is None else None
         
         # Sort by opportunity score and closing date
         high_priority = [opp for opp in opportunities if opp.opportunity_score == OpportunityScore.HIGH]
@@ -693,7 +1203,7 @@ class ActuarialTenderMonitor:
                 service_breakdown[service_area].append(opp)
         
         # Generate report
-        report = f"""# Actuarial Tender Opportunities Report
+        emit(f"""# Actuarial Tender Opportunities Report
 **Period:** Last {days_back} days
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
 
@@ -704,70 +1214,237 @@ class ActuarialTenderMonitor:
 - **Geographic Coverage:** {len(set(opp.location for opp in opportunities))} locations
 
 ## High Priority Opportunities
-"""
+""")
         
         for i, opp in enumerate(high_priority[:10], 1):
             closing_info = f"Closes: {opp.closing_date.strftime('%Y-%m-%d')}" if opp.closing_date else "Closing date TBD"
             value_info = f"Value: {opp.estimated_value}" if opp.estimated_value else "Value: Not specified"
             
-            report += f"""
+            emit(f"""
 ### {i}. {opp.title}
 **Client:** {opp.client_organization}  
 **Location:** {opp.location}  
 **{closing_info}**  
 **{value_info}**  
-**Service Areas:** {', '.join([area.value.replace('_', ' ').title() for area in opp.service_areas_matched])}
+**Service Areas:** {_format_service_areas(tuple(opp.service_areas_matched))}
 
 **AI Analysis:** {opp.ai_analysis[:300]}...
 
 **URL:** {opp.url}
 
 ---
-"""
+""")
         
-        report += "\n## Service Area Breakdown\n"
+        emit("\n## Service Area Breakdown\n")
         for service_area, opps in service_breakdown.items():
-            service_name = service_area.value.replace('_', ' ').title()
-            report += f"- **{service_name}:** {len(opps)} opportunities\n"
+            service_name = SERVICE_AREA_LABELS[service_area]
+            emit(f"- **{service_name}:** {len(opps)} opportunities\n")
         
-        report += "\n## Medium Priority Opportunities\n"
+        emit("\n## Medium Priority Opportunities\n")
         for opp in medium_priority[:5]:
-            report += f"- **{opp.title}** ({opp.client_organization}) - {opp.location}\n"
+            emit(f"- **{opp.title}** ({opp.client_organization}) - {opp.location}\n")
         
-        return report
+        return "".join(parts) if writer is None else None
     
     def _load_recent_opportunities(self, days_back: int) -> List[TenderOpportunity]:
         """Load opportunities from recent days"""
-        opportunities = []
+        files_by_day = self._recent_data_files(days_back)
+        today = datetime.now().strftime('%Y%m%d')
+        
+        # Completed days with an up-to-date snapshot skip JSON parsing and rehydration
+        opportunities_by_day: Dict[str, List[TenderOpportunity]] = {}
+        sources_by_day: Dict[str, List[Path]] = {}
+        for date_str, paths in files_by_day.items():
+            sources = [path for path in paths if path.suffix != '.pkl']
+            snapshot = self._load_day_snapshot(paths[-1]) if paths[-1].suffix == '.pkl' else None
+            if snapshot is not None:
+                opportunities_by_day[date_str] = snapshot
+            else:
+                sources_by_day[date_str] = sources
+        
+        file_paths = [file_path for paths in sources_by_day.values() for file_path in paths]
+        if file_paths:
+            # Files are independent, so read and parse them concurrently
+            with ThreadPoolExecutor(max_workers=min(self.max_load_workers, len(file_paths))) as executor:
+                loaded = dict(zip(file_paths, executor.map(self._load_one_file, file_paths)))
+            
+            for date_str, paths in sources_by_day.items():
+                # A tender seen more than once in a day keeps its most recent record
+                day_opportunities: Dict[str, TenderOpportunity] = {}
+                for file_path in paths:
+                    for key, opportunity in loaded[file_path]:
+                        day_opportunities[key] = opportunity
+                
+                opportunities_by_day[date_str] = list(day_opportunities.values())
+                
+                # Past days no longer receive new records, so compact them for later loads
+                if date_str < today:
+                    self._save_day_snapshot(date_str, opportunities_by_day[date_str])
+        
+        return [opportunity for date_str in sorted(opportunities_by_day) for opportunity in opportunities_by_day[date_str]]
+    
+    def _load_recent_opportunities_raw(self, days_back: int) -> "pd.DataFrame":
+        """Load recent opportunities as a DataFrame of their saved records
+        
+        For callers that only read fields (such as the dashboard table): no
+        TenderOpportunity objects are built, so enums stay as their string values.
+        Date columns are parsed to datetime64 in one vectorized pass per column.
+        """
+        import pandas as pd
+        
+        columns = list(_field_names(TenderOpportunity))
+        
+        files_by_day = self._recent_data_files(days_back)
+        file_paths = [file_path for paths in files_by_day.values() for file_path in paths if file_path.suffix != '.pkl']
+        loaded: Dict[Path, List[Tuple[str, Dict]]] = {}
+        if file_paths:
+            with ThreadPoolExecutor(max_workers=min(self.max_load_workers, len(file_paths))) as executor:
+                loaded = dict(zip(file_paths, executor.map(self._read_records, file_paths)))
+        
+        records = []
+        for paths in files_by_day.values():
+            # A tender seen more than once in a day keeps its most recent record
+            day_records: Dict[str, Dict] = {}
+            for file_path in paths:
+                for key, data in loaded.get(file_path, ()):
+                    day_records[key] = data
+            records.extend(day_records.values())
+        
+        df = pd.DataFrame.from_records(records, columns=columns)
+        for column in self._DATE_FIELDS:
+            df[column] = pd.to_datetime(df[column], format='ISO8601', errors='coerce', cache=True)
+        
+        return df
+    
+    def _load_day_snapshot(self, snapshot_path: Path) -> Optional[List[TenderOpportunity]]:
+        """Load a day's pickled snapshot, or None if it is unreadable or outdated"""
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+            
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot {snapshot_path}: {str(e)}")
+            return None
+        
+        # Unpickling restores attributes by name, so a snapshot written before a field was
+        # added or removed would load cleanly yet yield incomplete objects
+        if not (isinstance(snapshot, tuple) and len(snapshot) == 2 and snapshot[0] == _field_names(TenderOpportunity)):
+            logger.info(f"Rebuilding outdated snapshot {snapshot_path}")
+            return None
+        
+        return snapshot[1]
+    
+    def _save_day_snapshot(self, date_str: str, opportunities: List[TenderOpportunity]):
+        """Pickle a completed day's merged opportunities to YYYYMMDD.pkl
+        
+        The JSONL log stays the source of truth; the snapshot is rebuilt whenever a
+        source file is newer than it or TenderOpportunity's fields have changed.
+        """
+        snapshot_path = self.data_dir / f"{date_str}.pkl"
+        tmp_path = snapshot_path.with_suffix('.pkl.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((_field_names(TenderOpportunity), opportunities), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot_path)
+        except Exception as e:
+            logger.warning(f"Error saving snapshot {snapshot_path}: {str(e)}")
+    
+    # TenderOpportunity fields saved as ISO date strings
+    _DATE_FIELDS = ('timestamp', 'publication_date', 'closing_date')
+    
+    # Sort order of a day's data files: legacy JSON, then the JSONL log, then the snapshot
+    _DATA_FILE_ORDER = {'.json': 0, '.jsonl': 1, '.pkl': 2}
+    
+    def _recent_data_files(self, days_back: int) -> Dict[str, List[Path]]:
+        """Find saved opportunity files from recent days with a single directory scan
+        
+        Returns paths grouped by YYYYMMDD date, oldest day first. Within a day, legacy
+        YYYYMMDD_<id>.json files come before the YYYYMMDD.jsonl log, and the
+        YYYYMMDD.pkl snapshot comes last if it is at least as new as the day's sources.
+        Empty (e.g. partially written) files and files last modified before the
+        window starts are skipped without being opened.
+        """
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days_back)
+        wanted = {(start_date + timedelta(days=day)).strftime('%Y%m%d') for day in range(days_back + 1)}
+        cutoff_ts = datetime.combine(start_date, datetime.min.time()).timestamp()
         
-        for day in range(days_back + 1):
-            check_date = start_date + timedelta(days=day)
-            date_str = check_date.strftime('%Y%m%d')
+        files_by_day: Dict[str, List[Tuple[Path, float]]] = {}
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                date_str = name[:8]
+                if date_str not in wanted:
+                    continue
+                if not (name in (f"{date_str}.jsonl", f"{date_str}.pkl") or (name.startswith('_', 8) and name.endswith('.json'))):
+                    continue
+                
+                stat = entry.stat()
+                if stat.st_size == 0 or stat.st_mtime < cutoff_ts:
+                    continue
+                files_by_day.setdefault(date_str, []).append((Path(entry.path), stat.st_mtime))
+        
+        recent_files = {}
+        for date_str in sorted(files_by_day):
+            files = sorted(files_by_day[date_str], key=lambda item: (self._DATA_FILE_ORDER[item[0].suffix], item[0].name))
             
-            for file_path in self.data_dir.glob(f"{date_str}_*.json"):
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                        
-                        # Convert enums and dates back
-                        data['status'] = TenderStatus(data['status'])
-                        data['opportunity_score'] = OpportunityScore(data['opportunity_score'])
-                        data['service_areas_matched'] = [ServiceArea(sa) for sa in data['service_areas_matched']]
-                        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-                        
-                        if data.get('closing_date'):
-                            data['closing_date'] = datetime.fromisoformat(data['closing_date'])
-                        if data.get('publication_date'):
-                            data['publication_date'] = datetime.fromisoformat(data['publication_date'])
-                        
-                        opportunities.append(TenderOpportunity(**data))
-                        
-                except Exception as e:
-                    logger.error(f"Error loading opportunity {file_path}: {str(e)}")
+            # Drop a snapshot that predates any of the day's source files
+            if files[-1][0].suffix == '.pkl' and any(mtime > files[-1][1] for _, mtime in files[:-1]):
+                files.pop()
+            
+            recent_files[date_str] = [path for path, _ in files]
+        
+        return recent_files
+    
+    def _load_one_file(self, file_path: Path) -> List[Tuple[str, TenderOpportunity]]:
+        """Load (tender_id, opportunity) pairs from one saved data file"""
+        opportunities = []
+        for key, data in self._read_records(file_path):
+            try:
+                opportunities.append((key, self._opportunity_from_dict(data)))
+            except Exception as e:
+                logger.error(f"Error loading opportunity {key} from {file_path}: {str(e)}")
         
         return opportunities
+    
+    def _read_records(self, file_path: Path) -> List[Tuple[str, Dict]]:
+        """Read (tender_id, record) pairs from a JSONL log or a legacy single-record JSON file"""
+        try:
+            with open(file_path, 'rb') as f:
+                if file_path.suffix != '.jsonl':
+                    data = _loads(f.read())
+                    return [(data.get('tender_id', file_path.stem), data)]
+                
+                records = []
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        data = _loads(line)
+                    except ValueError as e:
+                        logger.error(f"Skipping malformed line {line_no} in {file_path}: {str(e)}")
+                        continue
+                    records.append((data.get('tender_id', f"{file_path.name}:{line_no}"), data))
+                return records
+            
+        except Exception as e:
+            logger.error(f"Error loading opportunities from {file_path}: {str(e)}")
+            return []
+    
+    def _opportunity_from_dict(self, data: Dict) -> TenderOpportunity:
+        """Rebuild a TenderOpportunity from its saved JSON form"""
+        # Convert enums and dates back
+        data['status'] = TenderStatus(data['status'])
+        data['opportunity_score'] = OpportunityScore(data['opportunity_score'])
+        data['service_areas_matched'] = [ServiceArea(sa) for sa in data['service_areas_matched']]
+        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        
+        if data.get('closing_date'):
+            data['closing_date'] = datetime.fromisoformat(data['closing_date'])
+        if data.get('publication_date'):
+            data['publication_date'] = datetime.fromisoformat(data['publication_date'])
+        
+        return TenderOpportunity(**data)
 
 # Business Development utilities
 def setup_tender_monitoring():
@@ -780,25 +1457,33 @@ def setup_tender_monitoring():
     
     return ActuarialTenderMonitor(api_key)
 
-def run_daily_tender_scan():
-    """Daily tender scanning routine"""
+def run_daily_tender_scan() -> Tuple[List[TenderOpportunity], Path]:
+    """Daily tender scanning routine
+    
+    Returns the opportunities found and the path of the saved leads report. The
+    report is streamed to disk rather than built in memory, so read it from that
+    path when its text is needed.
+    """
     monitor = setup_tender_monitoring()
+    report_path = Path(f"daily_leads_report_{datetime.now().strftime('%Y%m%d')}.md")
     
     print("Starting daily tender scan...")
-    opportunities = monitor.monitor_all_sites()
-    
-    # Generate leads report
-    leads_report = monitor.generate_leads_report()
-    
-    # Save daily report
-    report_filename = f"daily_leads_report_{datetime.now().strftime('%Y%m%d')}.md"
-    with open(report_filename, 'w') as f:
-        f.write(leads_report)
+    try:
+        opportunities = monitor.monitor_all_sites()
+        
+        # Stream the leads report into a temporary file, replacing the daily report only
+        # once it is complete so a failed run leaves the previous report intact
+        tmp_path = report_path.with_suffix('.md.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            monitor.generate_leads_report(writer=f)
+        os.replace(tmp_path, report_path)
+    finally:
+        monitor.close()
     
     print(f"Scan complete. Found {len(opportunities)} opportunities.")
-    print(f"Report saved to {report_filename}")
+    print(f"Report saved to {report_path}")
     
-    return opportunities, leads_report
+    return opportunities, report_path
 
 if __name__ == "__main__":
     # Demo usage
@@ -806,7 +1491,7 @@ if __name__ == "__main__":
     print("="*50)
     
     try:
-        opportunities, report = run_daily_tender_scan()
+        opportunities, report_path = run_daily_tender_scan()
         print("\nSample opportunities found:")
         
         for i, opp in enumerate(opportunities[:3], 1):
@@ -0,0 +1,122 @@
+# Persistent response cache for OpenAI chat completions
+# Tenders stay listed for weeks, so every monitoring cycle re-sends identical prompts.
+# Serving those from a local SQLite file turns repeat calls into disk lookups.
+
+import functools
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_TTL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_ttl(ttl: Union[str, int, float]) -> float:
+    """Convert a TTL such as "7d", "12h" or a plain number of seconds to seconds"""
+    if isinstance(ttl, (int, float)):
+        return float(ttl)
+
+    ttl = ttl.strip().lower()
+    if ttl and ttl[-1] in _TTL_UNITS:
+        return float(ttl[:-1]) * _TTL_UNITS[ttl[-1]]
+    return float(ttl)
+
+def make_cache_key(model: str, messages: List[Dict[str, str]], **params) -> str:
+    """Deterministic SHA-256 digest of the model, prompt messages and request parameters"""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """SQLite-backed store of chat completion contents keyed by prompt digest"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One shared connection guarded by a lock so the cache can be used from worker threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached content for key, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, content: str, ttl_seconds: float):
+        """Store content under key for ttl_seconds"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, content, expires_at) VALUES (?, ?, ?)",
+                (key, content, time.time() + ttl_seconds)
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+def cached_chat(ttl: Union[str, int, float] = "7d") -> Callable:
+    """Cache a `(self, model, messages, **params) -> str` chat method in `self.llm_cache`
+
+    Methods on objects without an `llm_cache` attribute (or with it set to None) are
+    called directly. Cache failures are logged and never block the API call.
+    """
+    ttl_seconds = parse_ttl(ttl)
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, model: str, messages: List[Dict[str, str]], **params) -> str:
+            cache = getattr(self, "llm_cache", None)
+            if cache is None:
+                return func(self, model, messages, **params)
+
+            key = make_cache_key(model, messages, **params)
+            try:
+                content = cache.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache lookup failed: {str(e)}")
+                content = None
+
+            if content is not None:
+                return content
+
+            content = func(self, model, messages, **params)
+
+            if content is not None:
+                try:
+                    cache.set(key, content, ttl_seconds)
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache write failed: {str(e)}")
+
+            return content
+        return wrapper
+    return decorator